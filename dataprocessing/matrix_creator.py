@@ -0,0 +1,199 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+NORMALIZATIONS = ('none', 'cosine', 'jaccard', 'association')
+WEIGHTINGS = ('count', 'binary', 'log')
+SYMMETRIZATIONS = ('max', 'min', None)
+
+# Step 1: Vectorized version of helpers.row_matches_categories over a column of comma-separated categories
+# (rows with no category never match, unless "All" is selected)
+def rows_matching_categories(category_column, selected_categories):
+    if "All" in selected_categories:
+        return pd.Series(True, index=category_column.index)
+    row_categories = category_column.fillna('').astype(str).str.split(",").explode().str.strip()
+    return row_categories.isin(selected_categories).groupby(level=0).any()
+
+# Step 2: Stream the references CSV in chunks and count (row, referenced author) pairs
+def load_pair_counts(csv_file, row_column='book_filename', col_column='full_author_referenced',
+                     categories=None, chunksize=200000, merge_every=10):
+    usecols = [row_column, col_column] + (['predicted_category'] if categories is not None else [])
+    parts = []
+
+    # Only the key columns are read, and each chunk is collapsed to pair counts;
+    # the partial counts are merged every few chunks to keep the list of parts small
+    # Categories are read as strings so a chunk with no classified rows is not parsed as float
+    for chunk in pd.read_csv(csv_file, usecols=usecols, chunksize=chunksize, dtype={'predicted_category': str}):
+        if categories is not None:
+            chunk = chunk[rows_matching_categories(chunk['predicted_category'], categories)]
+        chunk = chunk.dropna(subset=[row_column, col_column])
+        parts.append(chunk.groupby([row_column, col_column]).size())
+        if len(parts) >= merge_every:
+            parts = [pd.concat(parts).groupby(level=[0, 1]).sum()]
+
+    if not parts:
+        return pd.Series(dtype='int64', index=pd.MultiIndex.from_tuples([], names=[row_column, col_column]))
+    return pd.concat(parts).groupby(level=[0, 1]).sum()
+
+# Step 3: Build the sparse incidence matrix (rows x referenced authors) from pair counts
+def build_incidence_matrix(pair_counts, weighting='count'):
+    if weighting not in WEIGHTINGS:
+        raise ValueError(f"weighting must be one of {WEIGHTINGS}, got {weighting!r}")
+
+    row_codes, row_labels = pd.factorize(pair_counts.index.get_level_values(0), sort=True)
+    col_codes, col_labels = pd.factorize(pair_counts.index.get_level_values(1), sort=True)
+    values = pair_counts.to_numpy(dtype=np.float64)
+
+    # Apply the requested weighting to the raw reference counts
+    if weighting == 'binary':
+        values = np.ones_like(values)
+    elif weighting == 'log':
+        values = np.log1p(values)
+
+    incidence = sparse.csr_matrix(
+        (values, (row_codes, col_codes)),
+        shape=(len(row_labels), len(col_labels))
+    )
+    return incidence, list(row_labels), list(col_labels)
+
+# Step 4: Keep only the k largest entries in each row of a CSR matrix
+def prune_top_k(matrix, top_k=None, min_weight=0.0):
+    matrix = matrix.tocsr(copy=True)
+    if min_weight > 0:
+        matrix.data[matrix.data < min_weight] = 0
+        matrix.eliminate_zeros()
+    if top_k is None:
+        return matrix
+
+    # Only rows with more than k entries need pruning; argpartition avoids sorting each of them fully
+    for i in np.flatnonzero(np.diff(matrix.indptr) > top_k):
+        start, end = matrix.indptr[i], matrix.indptr[i + 1]
+        row = matrix.data[start:end]
+        row[np.argpartition(row, -top_k)[:-top_k]] = 0
+    matrix.eliminate_zeros()
+    return matrix
+
+# Step 5: Drop self co-occurrence and normalize a block of raw co-occurrence rows
+def normalize_block(block, row_offset, diagonal, n_documents, normalization, keep_diagonal=False):
+    block = block.tocoo()
+    rows, cols, values = block.row, block.col, block.data
+
+    if not keep_diagonal:
+        off_diagonal = cols != rows + row_offset
+        rows, cols, values = rows[off_diagonal], cols[off_diagonal], values[off_diagonal]
+
+    # The diagonal holds each row's sum of squared weights, which is its occurrence count under binary weights
+    diag_rows = diagonal[rows + row_offset]
+    diag_cols = diagonal[cols]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if normalization == 'cosine':
+            values = values / np.sqrt(diag_rows * diag_cols)
+        elif normalization == 'jaccard':
+            values = values / (diag_rows + diag_cols - values)
+        elif normalization == 'association':
+            # Observed co-occurrence over the o_i * o_j / N expected if items occurred independently
+            values = values * n_documents / (diag_rows * diag_cols)
+    values = np.nan_to_num(values, nan=0.0, posinf=0.0, neginf=0.0)
+
+    return sparse.csr_matrix((values, (rows, cols)), shape=block.shape)
+
+# Step 6: Compute M M^T block by block so only one unpruned slice of the product is held in memory,
+# then symmetrize, since per-row top-k pruning can keep i -> j but drop j -> i
+# ('max' keeps a pair if either side kept it, 'min' only if both did, None leaves it as is)
+def sparse_gram(matrix, normalization='none', top_k=None, min_weight=0.0, block_size=1000,
+                keep_diagonal=False, symmetrize='max'):
+    if normalization not in NORMALIZATIONS:
+        raise ValueError(f"normalization must be one of {NORMALIZATIONS}, got {normalization!r}")
+    if symmetrize not in SYMMETRIZATIONS:
+        raise ValueError(f"symmetrize must be one of {SYMMETRIZATIONS}, got {symmetrize!r}")
+
+    matrix = matrix.tocsr()
+    if normalization == 'association' and not np.all(matrix.data == 1):
+        raise ValueError("association normalization requires binary weighting")
+    matrix_t = matrix.T.tocsr()
+    n = matrix.shape[0]
+    n_documents = matrix.shape[1]
+
+    # The diagonal of M M^T is each row's squared norm, computed once up front
+    diagonal = np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel()
+
+    blocks = []
+    for start in range(0, n, block_size):
+        end = min(start + block_size, n)
+        block = matrix[start:end] @ matrix_t
+        block = normalize_block(block, start, diagonal, n_documents, normalization, keep_diagonal)
+        blocks.append(prune_top_k(block, top_k, min_weight))
+
+    if not blocks:
+        return sparse.csr_matrix((n, n))
+    result = sparse.vstack(blocks, format='csr')
+
+    if symmetrize == 'max':
+        result = result.maximum(result.T).tocsr()
+    elif symmetrize == 'min':
+        result = result.minimum(result.T).tocsr()
+    return result
+
+# Step 7: Co-citation (referenced author x referenced author) is A^T A
+def co_citation_matrix(incidence, **kwargs):
+    return sparse_gram(incidence.T, **kwargs)
+
+# Step 8: Bibliographic coupling (row x row, e.g. book x book) is A A^T
+def bibliographic_coupling_matrix(incidence, **kwargs):
+    return sparse_gram(incidence, **kwargs)
+
+# Step 9: Save a sparse matrix with its labels to a single compressed .npz file
+def save_matrix(output_file, matrix, row_labels, col_labels=None):
+    matrix = matrix.tocsr()
+    if col_labels is None:
+        col_labels = row_labels
+    np.savez_compressed(
+        output_file,
+        data=matrix.data.astype(np.float32),
+        indices=matrix.indices,
+        indptr=matrix.indptr,
+        shape=np.array(matrix.shape),
+        row_labels=np.array(row_labels, dtype=str),
+        col_labels=np.array(col_labels, dtype=str)
+    )
+    print(f"Saved {matrix.shape[0]}x{matrix.shape[1]} matrix ({matrix.nnz} entries) to {output_file}")
+
+# Step 10: Load a matrix and its labels saved by save_matrix
+def load_matrix(input_file):
+    with np.load(input_file) as f:
+        matrix = sparse.csr_matrix((f['data'], f['indices'], f['indptr']), shape=tuple(f['shape']))
+        row_labels = f['row_labels'].tolist()
+        col_labels = f['col_labels'].tolist()
+    return matrix, row_labels, col_labels
+
+# Main function to build both matrices from the references CSV
+def main():
+    input_file = 'final.csv'  # The CSV file of extracted (and classified) references
+    row_column = 'book_filename'  # Use 'author_of_book' to couple authors instead of books
+    categories = None  # e.g. ['Ethics', 'Metaphysics'] to restrict to classified categories
+    weighting = 'count'  # One of 'count', 'binary', 'log'
+    normalization = 'cosine'  # One of 'none', 'cosine', 'jaccard', 'association' (binary weighting only)
+    top_k = 50  # Number of strongest neighbours kept per row
+    min_weight = 0.0  # Drop normalized weights below this value
+    block_size = 1000  # Rows of the product computed at a time
+    symmetrize = 'max'  # One of 'max', 'min', None (how to reconcile asymmetric top-k pruning)
+
+    # Count references and build the incidence matrix
+    pair_counts = load_pair_counts(input_file, row_column=row_column, categories=categories)
+    incidence, row_labels, col_labels = build_incidence_matrix(pair_counts, weighting)
+    save_matrix('incidence.npz', incidence, row_labels, col_labels)
+
+    options = dict(normalization=normalization, top_k=top_k, min_weight=min_weight, block_size=block_size,
+                   symmetrize=symmetrize)
+
+    # Which philosophers get cited together
+    co_citation = co_citation_matrix(incidence, **options)
+    save_matrix('co_citation.npz', co_citation, col_labels)
+
+    # Which books (or authors) cite the same predecessors
+    coupling = bibliographic_coupling_matrix(incidence, **options)
+    save_matrix('coupling.npz', coupling, row_labels)
+
+if __name__ == "__main__":
+    main()